@@ -9,28 +9,39 @@ import sys
 import time
 import json
 import threading
+import socket
+import enum
+import ctypes
+import operator
+from array import array
+from collections import deque
+import queue
 import subprocess
 import websocket
 import pyaudio
-import wave
 import logging
+from logging.handlers import QueueHandler, QueueListener
 import signal
+import fcntl
 import atexit
 from pathlib import Path
-from datetime import datetime
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
-# macOS imports
-from AppKit import NSApplication, NSApp
-from Foundation import NSObject, NSLog
-from Cocoa import NSEvent, NSKeyDownMask, NSKeyUpMask, NSFlagsChangedMask
-from PyObjCTools import AppHelper
-from AppKit import NSPasteboard, NSStringPboardType
+try:
+    from orjson import loads as json_loads  # C parser, takes the raw bytes frames directly
+except ImportError:
+    json_loads = json.loads
 
 # Load environment
 load_dotenv()
 
-# Configure logging
+# Configure logging - DEBUG adds throttled partial transcripts and silence-gate stats
+LOG_LEVEL = logging.getLevelName(os.getenv('WISPR_LOG_LEVEL', 'INFO').upper())
+if not isinstance(LOG_LEVEL, int):
+    LOG_LEVEL = logging.INFO  # Unknown name
+
 def setup_logging():
     """Setup logging to standard macOS location - FIXED DUPLICATE HANDLERS"""
     log_dir = Path.home() / "Library" / "Logs" / "Wispr"
@@ -43,13 +54,18 @@ def setup_logging():
     root_logger = logging.getLogger()
     root_logger.handlers.clear()
     
+    # Loggers only enqueue records; a background listener does the file writes,
+    # so the WebSocket and audio threads never block on disk I/O
+    log_queue = queue.SimpleQueue()
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    
     # Configure main app logging using root logger ONLY
     # For background service: only log to file (launchd handles stdout redirect)
     logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
+        level=LOG_LEVEL,
         handlers=[
-            logging.FileHandler(log_file)
+            QueueHandler(log_queue)
             # NO StreamHandler for background service - launchd handles stdout
         ],
         force=True  # Force reconfiguration
@@ -59,81 +75,226 @@ def setup_logging():
     transcript_logger = logging.getLogger('wispr.transcripts')
     # Clear existing handlers
     transcript_logger.handlers.clear()
+    transcript_queue = queue.SimpleQueue()
     transcript_handler = logging.FileHandler(transcript_log_file)
     transcript_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
-    transcript_logger.addHandler(transcript_handler)
+    transcript_logger.addHandler(QueueHandler(transcript_queue))
     transcript_logger.setLevel(logging.INFO)
     transcript_logger.propagate = False  # Don't propagate to main logger
     
+    for listener in (QueueListener(log_queue, file_handler, respect_handler_level=True),
+                     QueueListener(transcript_queue, transcript_handler, respect_handler_level=True)):
+        listener.start()
+        atexit.register(listener.stop)  # Flush queued records on exit
+    
     return logging.getLogger(), transcript_logger  # Use root logger directly
 
 logger, transcript_logger = setup_logging()
 
+def env_number(name, default, parse=int):
+    """Numeric setting from the environment - a typo warns and keeps the default"""
+    value = os.getenv(name, '').strip()
+    if not value:
+        return default
+    try:
+        return parse(value)
+    except ValueError:
+        logger.warning(f"⚠️ {name}={value!r} isn't a number, using {default}")
+        return default
+
 # Config
 API_KEY = os.getenv('ASSEMBLYAI_API_KEY')
 TRIGGER_KEY = os.getenv('WISPR_TRIGGER_KEY', 'fn')
 
+# Trigger key -> macOS virtual key code, resolved once so the key handler only compares ints
+TRIGGER_KEY_CODES = {
+    'fn': 63,  # Detected by flags: 0x800000 = pressed
+    'right_cmd': 54,
+    'right_ctrl': 62,
+    'caps_lock': 57,
+    'backslash': 42,
+}
+TRIGGER_KEY_CODE = TRIGGER_KEY_CODES.get(TRIGGER_KEY)
+MODIFIER_TRIGGER_KEYS = ('fn', 'right_cmd', 'right_ctrl', 'caps_lock')  # Arrive as flagsChanged
+TRIGGER_IS_FN = TRIGGER_KEY == 'fn'
+FN_KEY_MASK = 0x800000  # NSFunctionKeyMask
+
 if not API_KEY or API_KEY == 'your_api_key_here':
     logger.error("Please edit .env and add your AssemblyAI API key")
     sys.exit(1)
 
+# macOS imports - after the key check, so a misconfigured launch exits before paying for PyObjC
+from AppKit import NSApplication, NSApp, NSPasteboard, NSStringPboardType, NSSound
+from Foundation import NSObject
+from Cocoa import NSEvent, NSKeyDownMask, NSKeyUpMask, NSFlagsChangedMask, NSKeyDown, NSKeyUp, NSFlagsChanged
+from PyObjCTools import AppHelper
+from Quartz import (
+    CGEventCreateKeyboardEvent, CGEventPost, CGEventSetFlags, kCGHIDEventTap, kCGEventFlagMaskCommand,
+    CGEventSourceCreate, kCGEventSourceStateHIDSystemState, CGEventKeyboardSetUnicodeString,
+)
+from ApplicationServices import (
+    AXUIElementCreateSystemWide, AXUIElementCopyAttributeValue, AXUIElementSetAttributeValue,
+    kAXFocusedUIElementAttribute, kAXSelectedTextAttribute, kAXErrorSuccess,
+)
+
 # Audio settings
 SAMPLE_RATE = 16000
 CHANNELS = 1
 FORMAT = pyaudio.paInt16
-FRAMES_PER_BUFFER = 800  # 50ms chunks work fine with v3 API
-from urllib.parse import urlencode
+# Capture size and send size are independent: small capture buffers get audio off the
+# device sooner, and the sender coalesces them into one WebSocket message per batch
+FRAMES_PER_BUFFER = min(max(160, env_number('WISPR_AUDIO_BUFFER', 800)), SAMPLE_RATE)  # 800 = 50ms, at most 1s
+# AssemblyAI rejects messages outside 50-1000ms of audio
+MIN_MESSAGE_MS, MAX_MESSAGE_MS = 50, 1000
+SEND_BATCH_MS = min(max(env_number('WISPR_SEND_BATCH_MS', 100), MIN_MESSAGE_MS), MAX_MESSAGE_MS)  # Audio per WebSocket message
+MIN_MESSAGE_BYTES = SAMPLE_RATE * MIN_MESSAGE_MS // 1000 * 2  # 16-bit mono samples
+
+def ms_to_buffers(ms):
+    """Number of capture buffers covering at least ms milliseconds of audio"""
+    return max(1, -(-ms * SAMPLE_RATE // (1000 * FRAMES_PER_BUFFER)))
+
+def batch_buffers(ms):
+    """Capture buffers per WebSocket message - at least ms of audio, never over MAX_MESSAGE_MS"""
+    buffers = ms_to_buffers(ms)
+    if buffers * FRAMES_PER_BUFFER * 1000 > MAX_MESSAGE_MS * SAMPLE_RATE:
+        buffers -= 1  # Round down instead - one buffer never exceeds it
+    return buffers
+
+SEND_BATCH_BUFFERS = batch_buffers(SEND_BATCH_MS)
+
+# Optional silence gate: buffers quieter than this RMS (int16 scale) aren't uploaded. 0 = off.
+SILENCE_GATE_RMS = env_number('WISPR_SILENCE_GATE', 0)
+SILENCE_GATE_POWER = SILENCE_GATE_RMS ** 2  # Compare mean squares - no sqrt per buffer
+
+# Optional WebRTC VAD for the same gate (0-3, higher = stricter). Tells speech from steady
+# noise like fans far better than a level threshold. Empty = off; needs `pip install webrtcvad`.
+VAD_MODE = os.getenv('WISPR_VAD_MODE', '').strip()
+VAD_FRAME_BYTES = SAMPLE_RATE // 100 * 2  # webrtcvad only takes 10/20/30ms frames
+vad = None
+if VAD_MODE:
+    try:
+        import webrtcvad
+        vad = webrtcvad.Vad(min(max(int(VAD_MODE), 0), 3))
+    except ImportError:
+        logger.warning("⚠️ WISPR_VAD_MODE is set but webrtcvad isn't installed, using the RMS gate")
+    except ValueError:
+        logger.warning(f"⚠️ WISPR_VAD_MODE must be 0-3, got {VAD_MODE!r} - using the RMS gate")
+GATE_ENABLED = bool(vad or SILENCE_GATE_POWER)
+GATE_PREROLL_BUFFERS = ms_to_buffers(200)     # Sent ahead of speech so word onsets aren't clipped
+GATE_HANGOVER_BUFFERS = ms_to_buffers(500)    # Kept after speech so the server still hears the pause
+GATE_KEEPALIVE_BUFFERS = ms_to_buffers(1000)  # Still send one buffer per second of silence
+
+# Keep the session open between dictations; the server closes it after this many idle
+# seconds (AssemblyAI accepts 5-3600). 0 = reconnect for every dictation.
+SESSION_IDLE_TIMEOUT = env_number('WISPR_SESSION_IDLE_TIMEOUT', 60)
+if SESSION_IDLE_TIMEOUT:
+    SESSION_IDLE_TIMEOUT = min(max(SESSION_IDLE_TIMEOUT, 5), 3600)
+
+# Formatted turns add punctuation/casing but arrive ~400ms after the raw end of turn
+FORMAT_TURNS = os.getenv('WISPR_FORMAT_TURNS', 'true').lower() in ('1', 'true', 'yes')
 
 CONNECTION_PARAMS = {
     "sample_rate": SAMPLE_RATE,
-    "format_turns": True,
+    "format_turns": str(FORMAT_TURNS).lower(),
 }
+if SESSION_IDLE_TIMEOUT:
+    CONNECTION_PARAMS["inactivity_timeout"] = SESSION_IDLE_TIMEOUT
 API_ENDPOINT = f"wss://streaming.assemblyai.com/v3/ws?{urlencode(CONNECTION_PARAMS)}"
-YOUR_API_KEY = API_KEY
+WS_HEADER = {"Authorization": API_KEY}
+WS_SOCKOPT = (
+    # Push each small audio frame out immediately instead of letting Nagle coalesce it
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    # ~1s of audio: on a stalled link, later audio waits in our bounded queue, not the kernel's
+    (socket.SOL_SOCKET, socket.SO_SNDBUF, 32 * 1024),
+)
+# Transcripts are JSON we parse anyway, so skip websocket-client's per-byte UTF-8
+# validation (messages arrive as bytes)
+WS_RUN_OPTIONS = {"skip_utf8_validation": True, "sockopt": WS_SOCKOPT}
+if SESSION_IDLE_TIMEOUT:
+    # Ping the idle session so NAT/Wi-Fi drops are noticed before the next press, not during it
+    WS_RUN_OPTIONS.update(ping_interval=20, ping_timeout=10)
+TERMINATE_MESSAGE = b'{"type": "Terminate"}'  # Pre-encoded, sent as a text frame
+FORCE_ENDPOINT_MESSAGE = b'{"type": "ForceEndpoint"}'  # Ends the open turn, keeps the session
+
+# How text reaches the focused app: 'clipboard' (Cmd-V, works everywhere),
+# 'accessibility' (AX insert) or 'type' (synthesized keystrokes). The last two leave the
+# clipboard alone and fall back to it on failure.
+PASTE_METHOD = os.getenv('WISPR_PASTE_METHOD', 'clipboard').lower()
+# With 'type', enter each final turn as soon as it arrives instead of all at once on release
+LIVE_TYPING = PASTE_METHOD == 'type' and os.getenv('WISPR_LIVE_TYPING', 'false').lower() in ('1', 'true', 'yes')
+
+# Feedback sounds (resolved once, independent of the working directory)
+SOUNDS_DIR = Path(__file__).resolve().parent / "sounds"
+PRESS_SOUND = str(SOUNDS_DIR / "press.wav")
+RELEASE_SOUND = str(SOUNDS_DIR / "release.wav")
+
+class State(enum.Enum):
+    """Dictation lifecycle - the open session itself is tracked by ws_app"""
+    IDLE = 0
+    CONNECTING = 1  # Mic open, waiting for the WebSocket handshake
+    STREAMING = 2
+    STOPPING = 3  # Waiting for the final turn, then pasting
 
 # Global state
 trigger_pressed = False
-recording = False
-connecting = False  # Track connection state
-connection_active = False  # Track if we have an active connection
+state = State.IDLE
+state_lock = threading.Lock()  # Guards state transitions across the worker and WebSocket threads
 recent_errors = 0  # Track recent connection errors
 audio = None
 stream = None
 ws_app = None
 ws_thread = None
-stop_event = threading.Event()
-final_transcript = ""
-last_trigger_time = 0
+stream_thread = None
+# PCM buffers handed over by the PortAudio callback. Bounded so a stalled send can't let the
+# transcript fall further and further behind the speaker; the oldest audio is dropped first.
+AUDIO_BACKLOG_SECONDS = env_number('WISPR_AUDIO_BACKLOG', 5.0, float)  # Room for a slow handshake, not a dead link
+AUDIO_BACKLOG_BUFFERS = max(1, int(AUDIO_BACKLOG_SECONDS * SAMPLE_RATE / FRAMES_PER_BUFFER))
+audio_queue = queue.Queue(maxsize=AUDIO_BACKLOG_BUFFERS)
+audio_drops = 0  # Buffers discarded this dictation because the backlog was full
+STOP_SENTINEL = None  # Queued after the mic stops to end the streaming thread
+termination_event = threading.Event()  # Set once the server confirms the session ended
+turn_event = threading.Event()  # Set when a final turn arrives
+turn_pending = False  # Partial words heard that haven't reached a final turn yet
+last_partial_len = 0  # Length of the last partial transcript we logged
+last_partial_log_time = 0
+final_segments = []  # Final turns of the current dictation, joined at paste time
+typed_segments = 0  # Leading final_segments already entered by live typing
 last_stop_time = 0
 last_error_time = 0
 recording_start_time = 0  # Track actual recording start
-DEBOUNCE_DELAY = 0.3 # 300ms debounce
-MIN_RECORDING_DURATION = 0.5  # 500ms minimum recording
+# Timers use time.monotonic_ns() - immune to wall-clock jumps, integer compares only
+NS_PER_SEC = 1_000_000_000
+MIN_RECORDING_NS = 500_000_000  # 500ms minimum recording
 # PRODUCTION-READY COOLDOWNS for indefinite background operation
-CONNECTION_COOLDOWN = 3.0  # 3 seconds between connections (more conservative)
-ERROR_COOLDOWN = 10.0  # 10 seconds after errors (much more conservative)
-POLICY_VIOLATION_COOLDOWN = 30.0  # 30 seconds after 1008 policy violations
+CONNECTION_COOLDOWN_NS = 3 * NS_PER_SEC  # Between connections when sessions aren't reused
+ERROR_COOLDOWN_NS = 10 * NS_PER_SEC  # 10 seconds after errors (much more conservative)
+POLICY_VIOLATION_COOLDOWN_NS = 30 * NS_PER_SEC  # 30 seconds after 1008 policy violations
+ERROR_WINDOW_NS = 60 * NS_PER_SEC  # Errors older than this are forgotten; also the backoff cap
+PARTIAL_LOG_MIN_CHARS = 8  # Log a partial once it grew this much...
+PARTIAL_LOG_INTERVAL = 0.25  # ...or this many seconds passed
+TERMINATION_TIMEOUT = 1.5  # Max wait for the server to flush final turns after Terminate/ForceEndpoint
 
 # Global variables for robust state management
 global_event_monitor = None  # Track single event monitor
-handler_active = False       # Prevent handler re-entry
+pid_lock_fd = None           # Held open for the process lifetime - owns the single-instance lock
+SINGLE_INSTANCE_TIMEOUT = 3.0  # Max wait for a previous instance to exit after SIGTERM
+loaded_sounds = {}           # Preloaded NSSound per sound file
+# start_recording/stop_recording queued by the key handler for the single command worker
+command_queue = queue.SimpleQueue()
+# Single worker for the afplay fallback - bounds concurrent afplay processes on key-mash
+sound_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wispr-sound")
 
 # Declare all global variables used throughout the application
 audio = None
 stream = None
 ws_app = None
 ws_thread = None
-recording = False
-connecting = False
-connection_active = False
 trigger_pressed = False
-last_trigger_time = 0
 last_stop_time = 0
 recent_errors = 0
 last_error_time = 0
 recording_start_time = 0
-final_transcript = ""
-stop_event = threading.Event()
+final_segments = []
 
 def init_audio():
     """Initialize PyAudio"""
@@ -146,8 +307,43 @@ def init_audio():
         logger.error(f"❌ Audio initialization failed: {e}")
         return False
 
+def audio_callback(in_data, frame_count, time_info, status):
+    """PortAudio callback - hand captured PCM to the streaming thread"""
+    enqueue_audio(in_data)
+    return (None, pyaudio.paContinue)
+
+def enqueue_audio(item):
+    """Queue a buffer, dropping the oldest one if the sender has fallen behind"""
+    global audio_drops
+    while True:
+        try:
+            audio_queue.put_nowait(item)
+            return
+        except queue.Full:
+            try:
+                audio_queue.get_nowait()
+                audio_drops += 1
+            except queue.Empty:
+                pass
+
+def init_sounds():
+    """Preload feedback sounds so triggers don't spawn an afplay process each time"""
+    for sound_file in (PRESS_SOUND, RELEASE_SOUND):
+        sound = NSSound.alloc().initWithContentsOfFile_byReference_(sound_file, True)
+        if sound:
+            loaded_sounds[sound_file] = sound
+        else:
+            logger.warning(f"⚠️ Could not preload {sound_file}, falling back to afplay")
+
 def play_sound(sound_file):
     """Play a sound file asynchronously"""
+    sound = loaded_sounds.get(sound_file)
+    if sound:
+        # NSSound plays in-process and returns immediately; stop() rewinds a sound still playing
+        sound.stop()
+        sound.play()
+        return
+    
     def _play():
         try:
             # Use macOS built-in afplay for simple and reliable playback
@@ -155,56 +351,131 @@ def play_sound(sound_file):
         except Exception as e:
             logger.error(f"❌ Sound playback error: {e}")
     
-    # Play sound in background thread to not block main functionality
-    threading.Thread(target=_play, daemon=True).start()
-
-def is_trigger_key(key_code, flags):
-    """Check if this is our trigger key"""
-    if TRIGGER_KEY == 'fn':
-        # Fn key is code=63, detect by flags: 0x800000 = pressed, 0x100 = released
-        return key_code == 63
-    elif TRIGGER_KEY == 'right_cmd':
-        return key_code == 54
-    elif TRIGGER_KEY == 'right_ctrl':
-        return key_code == 62
-    elif TRIGGER_KEY == 'caps_lock':
-        return key_code == 57
-    elif TRIGGER_KEY == 'backslash':
-        return key_code == 42
-    else:
-        return False
+    # Play sound on the reusable worker to not block main functionality
+    sound_executor.submit(_play)
+
+QOS_CLASS_USER_INTERACTIVE = 0x21  # <sys/qos.h>
+try:
+    libsystem = ctypes.CDLL('/usr/lib/libSystem.B.dylib')
+except OSError:
+    libsystem = None
+
+def raise_thread_qos():
+    """Ask the scheduler to treat the calling thread as user-interactive"""
+    if libsystem is None:
+        return
+    err = libsystem.pthread_set_qos_class_self_np(QOS_CLASS_USER_INTERACTIVE, 0)
+    if err:
+        logger.debug("pthread_set_qos_class_self_np failed: %s", err)
+
+def buffer_power(buf):
+    """Mean square of a native-endian int16 PCM buffer"""
+    samples = array('h', buf)
+    return sum(map(operator.mul, samples, samples)) // len(samples)
 
-def is_fn_pressed(flags):
-    """Check if Fn key is currently pressed based on flags"""
-    return (flags & 0x800000) != 0  # NSFunctionKeyMask
+def buffer_has_speech(buf):
+    """Whether a capture buffer should open the silence gate"""
+    if vad:
+        # Speech in any 10ms slice counts - an onset can land anywhere in the buffer
+        return any(vad.is_speech(buf[i:i + VAD_FRAME_BYTES], SAMPLE_RATE)
+                   for i in range(0, len(buf) - VAD_FRAME_BYTES + 1, VAD_FRAME_BYTES))
+    return buffer_power(buf) >= SILENCE_GATE_POWER
+
+def stream_audio(ws):
+    """Forward captured audio to the session until the sentinel arrives"""
+    # Keep up with the capture cadence even when other apps load the CPU
+    raise_thread_qos()
+    # Coalesce several buffers per message to cut per-frame WS/TLS/syscall overhead.
+    # The batch is allocated once and filled in place; the frame is built synchronously in
+    # send(), so the same bytearray is handed over directly and refilled afterwards.
+    batch_bytes = FRAMES_PER_BUFFER * 2 * SEND_BATCH_BUFFERS  # 16-bit mono samples
+    batch = bytearray(batch_bytes)
+    filled = 0
+    # Silence gate state - held-back buffers stay in order so audio is never reordered
+    preroll = deque()
+    hangover = 0
+    silent = 0  # Gated buffers so far, paces the keepalive
+    held_back = 0  # Silent buffers never sent - not the ones that went out as pre-roll
+    while True:
+        # Blocks until PortAudio delivers a buffer - no polling while idle
+        buf = audio_queue.get()
+        if buf is STOP_SENTINEL:
+            break
+        chunks = (buf,)
+        if GATE_ENABLED:
+            if buffer_has_speech(buf):
+                hangover = GATE_HANGOVER_BUFFERS
+                if preroll:
+                    # Held-back pre-roll goes out ahead of the onset, oldest first
+                    preroll.append(buf)
+                    chunks = tuple(preroll)
+                    preroll.clear()
+            elif hangover:
+                hangover -= 1
+            else:
+                preroll.append(buf)
+                silent += 1
+                if silent % GATE_KEEPALIVE_BUFFERS:
+                    if len(preroll) > GATE_PREROLL_BUFFERS:
+                        preroll.popleft()  # Dropped silence
+                        held_back += 1
+                    continue
+                chunks = (preroll.popleft(),)  # Keepalive: oldest held buffer, keeps the order
+        try:
+            for chunk in chunks:
+                # Capture buffers are all the same size, so they tile the batch exactly
+                end = filled + len(chunk)
+                batch[filled:end] = chunk
+                if end >= batch_bytes:
+                    ws.send(batch, websocket.ABNF.OPCODE_BINARY)
+                    del batch[batch_bytes:]  # No-op unless an odd-sized buffer grew it
+                    filled = 0
+                else:
+                    filled = end
+        except Exception as e:
+            logger.error(f"❌ Streaming error: {e}")
+            return
+    
+    held_back += len(preroll)  # Pre-roll still waiting for speech when the dictation ended
+    if held_back:
+        logger.debug("🔇 Silence gate held back %.1fs of audio", held_back * FRAMES_PER_BUFFER / SAMPLE_RATE)
+    
+    # The sentinel is queued after the mic stops, so everything captured is in the batch
+    if filled:
+        if filled < MIN_MESSAGE_BYTES:
+            # Pad a short tail with silence rather than send an undersized message
+            batch[filled:MIN_MESSAGE_BYTES] = bytes(MIN_MESSAGE_BYTES - filled)
+            filled = MIN_MESSAGE_BYTES
+        try:
+            ws.send(batch[:filled], websocket.ABNF.OPCODE_BINARY)
+        except Exception as e:
+            logger.error(f"❌ Streaming flush error: {e}")
+
+def begin_streaming(ws):
+    """Mark the dictation live and start the sender thread - call with state_lock held"""
+    global state, recording_start_time, stream_thread
+    state = State.STREAMING
+    recording_start_time = time.monotonic_ns()  # Set actual recording start time
+    stream_thread = threading.Thread(target=stream_audio, args=(ws,), daemon=True)
+    stream_thread.start()
 
 def on_ws_open(ws):
     """WebSocket opened"""
-    global recording, connecting, recording_start_time, connection_active
+    with state_lock:
+        stale = ws is not ws_app
+        # The trigger may have been released mid-handshake - then just keep the session warm
+        if not stale and state == State.CONNECTING:
+            begin_streaming(ws)
+    if stale:
+        ws.close()  # A handshake we already gave up on - don't let it take over the new press
+        return
     logger.info("🔗 Connected to AssemblyAI")
-    connecting = False
-    recording = True
-    connection_active = True
-    recording_start_time = time.time()  # Set actual recording start time
-    
-    def stream_audio():
-        global recording, stream, stop_event
-        while recording and not stop_event.is_set():
-            try:
-                if stream and stream.is_active():
-                    data = stream.read(FRAMES_PER_BUFFER, exception_on_overflow=False)
-                    ws.send(data, websocket.ABNF.OPCODE_BINARY)
-            except Exception as e:
-                logger.error(f"❌ Streaming error: {e}")
-                break
-    
-    threading.Thread(target=stream_audio, daemon=True).start()
 
 def on_ws_message(ws, message):
     """Handle WebSocket message"""
-    global final_transcript
+    global turn_pending, last_partial_len, last_partial_log_time, typed_segments
     try:
-        data = json.loads(message)
+        data = json_loads(message)
         msg_type = data.get('type')
         
         if msg_type == "Begin":
@@ -212,180 +483,246 @@ def on_ws_message(ws, message):
             logger.info(f"🔗 Session started: {session_id}")
         elif msg_type == "Turn":
             transcript = data.get('transcript', '')
-            formatted = data.get('turn_is_formatted', False)
-            if formatted:
+            # Without formatting, the raw end-of-turn message is the final text
+            if FORMAT_TURNS:
+                final = data.get('turn_is_formatted', False)
+            else:
+                final = data.get('end_of_turn', False)
+            if final:
                 transcript_text = transcript.strip()
+                if state not in (State.STREAMING, State.STOPPING):
+                    # Arrived after the paste - it belongs to no dictation
+                    if transcript_text:
+                        logger.warning(f"⚠️ Discarding late turn: \"{transcript_text}\"")
+                    transcript_text = ""
                 if transcript_text:
                     # Accumulate all transcript segments, don't replace!
-                    if final_transcript:
-                        final_transcript += " " + transcript_text
-                    else:
-                        final_transcript = transcript_text
+                    final_segments.append(transcript_text)
                     logger.info(f"📝 Added segment: \"{transcript_text}\"")
-                    logger.info(f"📝 Full transcript so far: \"{final_transcript}\"")
+                    logger.info(f"📝 Full transcript so far: \"{' '.join(final_segments)}\"")
                     # Log transcript segment to dedicated log
                     transcript_logger.info(f"SEGMENT: {transcript_text}")
-                    # Don't paste yet! Wait for Fn key release
+                    # After a failed segment stop typing live, so the rest is pasted in order
+                    if LIVE_TYPING and typed_segments == len(final_segments) - 1:
+                        if type_segment(transcript_text, typed_segments > 0):
+                            typed_segments += 1
+                    # Otherwise don't paste yet! Wait for Fn key release
+                turn_pending = False
+                last_partial_len = 0
+                turn_event.set()  # Final turn delivered
             else:
-                # Partial transcript, show as it comes
-                print(f"\r{transcript}", end='')  # Use print for real-time display
+                if transcript:
+                    turn_pending = True
+                # Partial transcript - only log when it has grown noticeably, not every frame,
+                # and skip the bookkeeping entirely unless debug logging is on
+                if logger.isEnabledFor(logging.DEBUG):
+                    now = time.monotonic()
+                    if (len(transcript) - last_partial_len >= PARTIAL_LOG_MIN_CHARS
+                            or now - last_partial_log_time > PARTIAL_LOG_INTERVAL):
+                        last_partial_len = len(transcript)
+                        last_partial_log_time = now
+                        logger.debug("💬 Partial: %s", transcript)
         elif msg_type == "Termination":
             logger.info("🔚 Session terminated")
+            termination_event.set()  # All final turns have been delivered
     except Exception as e:
         logger.error(f"❌ Message handling error: {e}")
 
 def on_ws_error(ws, error):
     """WebSocket error"""
-    global recording, connecting, connection_active
     logger.error(f"❌ Connection error: {error}")
-    stop_event.set()
-    recording = False
-    connecting = False
-    connection_active = False
 
 def on_ws_close(ws, close_status_code, close_msg):
     """WebSocket closed"""
-    global recording, connecting, last_stop_time, connection_active, recent_errors, last_error_time
+    global state, last_stop_time, recent_errors, last_error_time
     if close_status_code:
         logger.warning(f"🔌 Disconnected: {close_status_code}")
         if close_status_code == 1008:
             logger.warning("⚠️ Policy violation detected - enforcing LONG cooldown for background stability")
             recent_errors += 1
-            last_error_time = time.time()
+            last_error_time = time.monotonic_ns()
             # Force much longer cooldown for policy violations
-            last_stop_time = time.time() + POLICY_VIOLATION_COOLDOWN - CONNECTION_COOLDOWN
-    recording = False
-    connecting = False
-    connection_active = False
-    cleanup_audio()
+            last_stop_time = last_error_time + POLICY_VIOLATION_COOLDOWN_NS - ERROR_COOLDOWN_NS
+    with state_lock:
+        if ws is not ws_app:
+            return  # A session we already replaced - the current dictation isn't affected
+        # stop_recording owns the teardown once it's STOPPING
+        stopping = state == State.STOPPING
+        if not stopping:
+            state = State.IDLE
+    termination_event.set()  # Nothing more will arrive - don't keep stop_recording waiting
+    turn_event.set()
+    if not stopping:
+        cleanup_audio()
+
+def session_connected():
+    """Check whether the warm session can take another dictation"""
+    sock = getattr(ws_app, 'sock', None)
+    return sock is not None and sock.connected
+
+def init_microphone():
+    """Pre-open the input stream - opening the device is the slow part of starting capture"""
+    global stream
+    try:
+        stream = open_input_stream()
+    except Exception as e:
+        logger.warning(f"⚠️ Could not pre-open microphone ({e}), will retry on first press")
+
+def open_input_stream():
+    """Open the microphone in callback mode, stopped until a dictation starts it"""
+    # PortAudio's thread delivers buffers, and audio captured while connecting is queued instead of lost
+    return audio.open(
+        input=True,
+        frames_per_buffer=FRAMES_PER_BUFFER,
+        channels=CHANNELS,
+        format=FORMAT,
+        rate=SAMPLE_RATE,
+        stream_callback=audio_callback,
+        start=False,
+    )
+
+def open_microphone():
+    """Start capturing on the pre-opened stream"""
+    global stream, audio_drops
+    # Drop any audio left over from a previous dictation
+    while not audio_queue.empty():
+        audio_queue.get_nowait()
+    audio_drops = 0
+    
+    if stream is None:
+        stream = open_input_stream()
+    try:
+        stream.start_stream()
+    except Exception as e:
+        # The device may have gone away since the stream was opened - reopen once
+        logger.warning(f"⚠️ Could not restart audio stream ({e}), reopening")
+        close_microphone()
+        stream = open_input_stream()
+        stream.start_stream()
+
+def close_microphone():
+    """Release the input stream entirely"""
+    global stream
+    if stream:
+        try:
+            stream.close()
+        except Exception as e:
+            logger.error(f"❌ Audio close error: {e}")
+        finally:
+            stream = None
 
 def start_recording():
     """Start recording - ROBUST STATE MANAGEMENT"""
-    global recording, connecting, stream, ws_app, ws_thread, stop_event, final_transcript, last_stop_time, connection_active, recent_errors, last_error_time
+    global state, ws_app, ws_thread, recent_errors, turn_pending, typed_segments
     
     # CRITICAL: Prevent overlapping recordings/connections
-    if recording or connecting or connection_active:
-        logger.warning("⚠️ Recording already in progress or connection active - BLOCKED")
-        return
-    
-    # CRITICAL: Check if WebSocket thread is still alive from previous session
-    if ws_thread and ws_thread.is_alive():
-        logger.warning("⚠️ Previous WebSocket thread still active - BLOCKED")
-        return
-    
-    # CRITICAL: Check if WebSocket app still exists
-    if ws_app and hasattr(ws_app, 'sock') and ws_app.sock:
-        logger.warning("⚠️ Previous WebSocket connection still active - BLOCKED")
-        return
-    
-    # ROBUST CONNECTION COOLDOWN for background stability
-    current_time = time.time()
-    cooldown_needed = CONNECTION_COOLDOWN
-    
-    # Reset error count if enough time has passed (60s for production)
-    if (current_time - last_error_time) > 60:
-        recent_errors = 0
-    
-    # If we've had recent errors, use exponentially longer cooldown
-    if recent_errors > 0 and (current_time - last_error_time) < 60:
-        # Exponential backoff: 10s, 20s, 40s, capped at 60s
-        cooldown_needed = min(ERROR_COOLDOWN * (2 ** (recent_errors - 1)), 60.0)
-        logger.warning(f"⚠️ Recent errors detected ({recent_errors}), using {cooldown_needed}s cooldown for stability")
-    
-    if current_time - last_stop_time < cooldown_needed:
-        logger.info(f"⏳ Connection cooldown: {cooldown_needed - (current_time - last_stop_time):.1f}s remaining")
-        return
-    
-    connecting = True
-    recording = False
-    final_transcript = ""
-    stop_event.clear()
-    
-    try:
-        # Open microphone
-        stream = audio.open(
-            input=True,
-            frames_per_buffer=FRAMES_PER_BUFFER,
-            channels=CHANNELS,
-            format=FORMAT,
-            rate=SAMPLE_RATE,
-        )
+    with state_lock:
+        if state != State.IDLE:
+            logger.warning(f"⚠️ Dictation {state.name.lower()} - BLOCKED")
+            return
+        # A sender stuck in ws.send would swallow the next dictation's queue and sentinel
+        if stream_thread and stream_thread.is_alive():
+            logger.warning("⚠️ Previous dictation still sending - BLOCKED")
+            return
         
-        # Create WebSocket
-        ws_app = websocket.WebSocketApp(
-            API_ENDPOINT,
-            header={"Authorization": YOUR_API_KEY},
-            on_open=on_ws_open,
-            on_message=on_ws_message,
-            on_error=on_ws_error,
-            on_close=on_ws_close,
-        )
+        final_segments.clear()
+        typed_segments = 0
+        turn_pending = False
+        turn_event.clear()
         
-        # Start WebSocket in thread
-        ws_thread = threading.Thread(target=ws_app.run_forever)
-        ws_thread.daemon = True
-        ws_thread.start()
+        # Warm path: the session from the last dictation is still open, skip the handshake
+        if session_connected():
+            try:
+                open_microphone()
+                begin_streaming(ws_app)
+                logger.info("🔗 Reusing open AssemblyAI session")
+            except Exception as e:
+                logger.error(f"❌ Recording start error: {e}")
+                state = State.IDLE
+                cleanup_audio()
+            return
         
-    except Exception as e:
-        logger.error(f"❌ Recording start error: {e}")
-        connecting = False
-        recording = False
-        connection_active = False
-
-def stop_recording():
-    """Stop recording"""
-    global recording, connecting, ws_app, final_transcript, recording_start_time, last_stop_time, ws_thread, connection_active
-    
-    if not recording and not connecting and not connection_active:
-        return
-    
-    # Check minimum recording duration (only if we actually started recording)
-    current_time = time.time()
-    if recording_start_time > 0:
-        recording_duration = current_time - recording_start_time
+        # A handshake is already under way (released before it finished) - ride along
+        if ws_thread and ws_thread.is_alive():
+            try:
+                open_microphone()
+                state = State.CONNECTING
+            except Exception as e:
+                logger.error(f"❌ Recording start error: {e}")
+            return
         
-        if recording_duration < MIN_RECORDING_DURATION:
-            logger.warning(f"⚠️ Recording too short ({recording_duration:.1f}s < {MIN_RECORDING_DURATION}s), ignoring")
-            recording = False
-            connecting = False
-            connection_active = False
-            recording_start_time = 0
-            cleanup_audio()
+        # A warm session only backs off after errors. Without reuse every press opens a new
+        # connection, so those keep a reconnect cooldown against 1008 rate-limit closes.
+        current_time = time.monotonic_ns()
+        cooldown_needed = 0 if SESSION_IDLE_TIMEOUT else CONNECTION_COOLDOWN_NS
+        
+        # Reset error count if enough time has passed (60s for production)
+        if (current_time - last_error_time) > ERROR_WINDOW_NS:
+            recent_errors = 0
+        
+        # If we've had recent errors, use exponentially longer cooldown
+        if recent_errors > 0:
+            # Exponential backoff: 10s, 20s, 40s, capped at 60s
+            cooldown_needed = max(cooldown_needed, min(ERROR_COOLDOWN_NS * (2 ** (recent_errors - 1)), ERROR_WINDOW_NS))
+            logger.warning(f"⚠️ Recent errors detected ({recent_errors}), using {cooldown_needed // NS_PER_SEC}s cooldown for stability")
+        
+        if current_time - last_stop_time < cooldown_needed:
+            logger.info(f"⏳ Connection cooldown: {(cooldown_needed - (current_time - last_stop_time)) / NS_PER_SEC:.1f}s remaining")
             return
-    elif connecting:
-        # If we're still connecting, don't allow immediate stop
-        logger.warning(f"⚠️ Still connecting, ignoring rapid stop")
-        return
-    
-    recording = False
-    connecting = False
-    connection_active = False
-    recording_start_time = 0  # Reset recording start time
-    last_stop_time = current_time
-    
-    # Send termination with better error handling
-    if ws_app and hasattr(ws_app, 'sock') and ws_app.sock:
+        
+        state = State.CONNECTING
+        termination_event.clear()
+        
         try:
-            if ws_app.sock.connected:
-                terminate_message = {"type": "Terminate"}
-                ws_app.send(json.dumps(terminate_message))
-                time.sleep(0.1)
+            open_microphone()
+            
+            # Create WebSocket
+            ws_app = websocket.WebSocketApp(
+                API_ENDPOINT,
+                header=WS_HEADER,
+                on_open=on_ws_open,
+                on_message=on_ws_message,
+                on_error=on_ws_error,
+                on_close=on_ws_close,
+            )
+            
+            # Start WebSocket in thread
+            ws_thread = threading.Thread(target=ws_app.run_forever, kwargs=WS_RUN_OPTIONS)
+            ws_thread.daemon = True
+            ws_thread.start()
+            
         except Exception as e:
-            logger.error(f"❌ Termination error: {e}")
-    
-    # Close WebSocket with proper cleanup sequence
+            logger.error(f"❌ Recording start error: {e}")
+            state = State.IDLE
+            cleanup_audio()
+
+def finish_turn():
+    """Force the open turn to end and wait for its final text - False if it never came"""
+    turn_event.clear()
+    ws_app.send(FORCE_ENDPOINT_MESSAGE, websocket.ABNF.OPCODE_TEXT)
+    # Always wait for the reply: the last words may not even have shown up as a partial yet
+    if not turn_event.wait(timeout=TERMINATION_TIMEOUT):
+        logger.warning("⚠️ No final turn from server, pasting what we have")
+        return False
+    return True
+
+def end_session():
+    """Terminate the session and wait for the server to flush final turns"""
+    ws_app.send(TERMINATE_MESSAGE, websocket.ABNF.OPCODE_TEXT)
+    # Wait for the final turns instead of guessing with a fixed sleep
+    if not termination_event.wait(timeout=TERMINATION_TIMEOUT):
+        logger.warning("⚠️ No Termination from server, pasting what we have")
+
+def close_session():
+    """Close the WebSocket and wait for its thread to exit"""
+    global ws_app, ws_thread, last_stop_time
     if ws_app:
         try:
-            # Signal stop first
-            stop_event.set()
-            time.sleep(0.1)  # Brief pause
-            
-            # Close WebSocket
             ws_app.close()
             
             # Wait for WebSocket thread to finish with robust checking
             thread_to_join = ws_thread  # Capture reference
-            if thread_to_join and hasattr(thread_to_join, 'is_alive'):
+            if thread_to_join and thread_to_join is not threading.current_thread():
                 try:
                     if thread_to_join.is_alive():
                         thread_to_join.join(timeout=3.0)
@@ -399,56 +736,165 @@ def stop_recording():
             # Force cleanup
             ws_app = None
             ws_thread = None
+            # The reconnect cooldown runs from here - never shorten a pending 1008 one
+            last_stop_time = max(last_stop_time, time.monotonic_ns())
+
+def stop_recording():
+    """Stop recording"""
+    global state, recording_start_time
+    
+    with state_lock:
+        if state == State.CONNECTING:
+            # Released before the handshake finished - nothing was sent, so a warm
+            # session can still come up for the next press
+            logger.warning("⚠️ Released while connecting, discarding")
+            state = State.IDLE
+            cleanup_audio()
+            drop_session = not SESSION_IDLE_TIMEOUT
+        elif state != State.STREAMING:
+            return
+        else:
+            # Check minimum recording duration
+            recording_duration = time.monotonic_ns() - recording_start_time
+            recording_start_time = 0  # Reset recording start time
+            if recording_duration < MIN_RECORDING_NS:
+                logger.warning(f"⚠️ Recording too short ({recording_duration / NS_PER_SEC:.1f}s < {MIN_RECORDING_NS / NS_PER_SEC}s), ignoring")
+                state = State.IDLE
+                cleanup_audio()
+                # Drop the session too, so the discarded audio can't leak into the next turn
+                drop_session = True
+            else:
+                state = State.STOPPING
+        stopping = state == State.STOPPING
+    
+    if not stopping:
+        if drop_session:
+            close_session()
+        return
+    
+    # Release the microphone now - the session itself stays warm for the next press
+    cleanup_audio()
+    
+    # Let the streaming thread flush its last batch before ending the turn
+    if stream_thread and stream_thread.is_alive():
+        stream_thread.join(timeout=0.5)
+    if stream_thread and stream_thread.is_alive():
+        # Stuck in ws.send - closing the socket makes the send fail so the sender exits
+        logger.warning("⚠️ Audio sender is stalled, dropping the session")
+        close_session()
+    if audio_drops:
+        logger.warning(f"⚠️ Dropped {audio_drops} audio buffers ({audio_drops * FRAMES_PER_BUFFER * 1000 // SAMPLE_RATE}ms) - sending fell behind")
+    
+    keep_session = bool(SESSION_IDLE_TIMEOUT)
+    if session_connected():
+        try:
+            if SESSION_IDLE_TIMEOUT:
+                # A reply still in flight would land in the next dictation - start fresh instead
+                keep_session = finish_turn()
+            else:
+                end_session()
+        except Exception as e:
+            logger.error(f"❌ Termination error: {e}")
+    
+    if not keep_session:
+        close_session()
     
     # NOW paste the final transcript when Fn key is released
-    if final_transcript:
+    if final_segments:
+        final_transcript = " ".join(final_segments)
+        # Live typing already entered the leading segments; whatever it didn't still gets pasted
+        typed = typed_segments if LIVE_TYPING else 0
+        untyped = final_segments[typed:]
+        final_segments.clear()  # Clear it
         logger.info(f"📋 Pasting: \"{final_transcript}\"")
         # Log complete transcription to dedicated log
         transcript_logger.info(f"COMPLETE_TRANSCRIPT: {final_transcript}")
-        paste_text(final_transcript)
-        final_transcript = ""  # Clear it
+        if untyped:
+            if LIVE_TYPING:
+                logger.warning(f"⚠️ {len(untyped)} segment(s) weren't typed live, pasting them now")
+            text = " ".join(untyped)
+            paste_text(" " + text if typed else text)
     
-    cleanup_audio()
+    with state_lock:
+        state = State.IDLE
 
 def cleanup_audio():
-    """Clean up audio with better error handling"""
-    global stream, ws_app, ws_thread, stop_event
-    
-    # Signal all threads to stop
-    stop_event.set()
-    
+    """Stop capturing - the stream stays open for the next press"""
     # Clean up audio stream with retries
     if stream:
         try:
-            # Wait a moment for any ongoing reads to complete
-            time.sleep(0.1)
-            
-            if hasattr(stream, 'is_active') and stream.is_active():
+            # stop_stream() returns once PortAudio has delivered its last callback - no settle sleeps
+            if stream.is_active():
                 stream.stop_stream()
-                time.sleep(0.05)  # Brief pause after stopping
-            
-            if hasattr(stream, 'close'):
-                stream.close()
-                
         except Exception as e:
             logger.error(f"❌ Audio cleanup error: {e}")
-        finally:
-            stream = None
+            close_microphone()  # Start from a fresh stream next time
     
-    # Ensure WebSocket cleanup
-    if ws_app:
-        try:
-            ws_app.close()
-        except:
-            pass
-        finally:
-            ws_app = None
-    
-    # Clean up thread reference
-    ws_thread = None
+    # No more callbacks can fire, so this lands behind the last captured buffer
+    enqueue_audio(STOP_SENTINEL)
+
+V_KEY_CODE = 9  # kVK_ANSI_V
+# One event source for every synthesized keystroke instead of a default one per event
+KEY_EVENT_SOURCE = CGEventSourceCreate(kCGEventSourceStateHIDSystemState)
+
+def press_cmd_v():
+    """Synthesize Cmd-V in-process instead of forking osascript"""
+    for key_down in (True, False):
+        event = CGEventCreateKeyboardEvent(KEY_EVENT_SOURCE, V_KEY_CODE, key_down)
+        CGEventSetFlags(event, kCGEventFlagMaskCommand)
+        CGEventPost(kCGHIDEventTap, event)
+
+def insert_text_accessibility(text):
+    """Replace the focused element's selection with text via the Accessibility API"""
+    system_wide = AXUIElementCreateSystemWide()
+    err, focused = AXUIElementCopyAttributeValue(system_wide, kAXFocusedUIElementAttribute, None)
+    if err != kAXErrorSuccess or focused is None:
+        return False
+    return AXUIElementSetAttributeValue(focused, kAXSelectedTextAttribute, text) == kAXErrorSuccess
+
+TYPE_CHUNK_CHARS = 10  # Apps drop unicode keystrokes longer than 20 UTF-16 units
+
+def type_text(text):
+    """Type text as synthesized unicode keystrokes - no clipboard round trip"""
+    for i in range(0, len(text), TYPE_CHUNK_CHARS):
+        chunk = text[i:i + TYPE_CHUNK_CHARS]
+        units = len(chunk.encode('utf-16-le')) // 2
+        for key_down in (True, False):
+            event = CGEventCreateKeyboardEvent(KEY_EVENT_SOURCE, 0, key_down)
+            CGEventSetFlags(event, 0)  # Keep held modifiers from turning text into shortcuts
+            CGEventKeyboardSetUnicodeString(event, units, chunk)
+            CGEventPost(kCGHIDEventTap, event)
+
+def type_segment(text, continues):
+    """Type one final turn into the focused app while the dictation is still going - False on failure"""
+    try:
+        type_text(" " + text if continues else text)
+        transcript_logger.info(f"TYPED: {text}")
+        return True
+    except Exception as e:
+        logger.error(f"❌ Live typing error: {e}")
+        return False
 
 def paste_text(text):
     """Paste text at cursor while preserving original clipboard"""
+    if PASTE_METHOD == 'accessibility':
+        try:
+            if insert_text_accessibility(text):
+                logger.info(f"📋 Inserted: \"{text}\"")
+                transcript_logger.info(f"PASTED: {text}")
+                return
+            logger.warning("⚠️ Focused element rejected AX insert, falling back to clipboard")
+        except Exception as e:
+            logger.error(f"❌ AX insert error: {e}")
+    elif PASTE_METHOD == 'type':
+        try:
+            type_text(text)
+            logger.info(f"📋 Typed: \"{text}\"")
+            transcript_logger.info(f"PASTED: {text}")
+            return
+        except Exception as e:
+            logger.error(f"❌ Typing error: {e}, falling back to clipboard")
+    
     try:
         # Get current clipboard content to restore later
         pasteboard = NSPasteboard.generalPasteboard()
@@ -466,14 +912,11 @@ def paste_text(text):
             logger.error("❌ Failed to set clipboard")
             return
         
-        # Wait for clipboard to be set
-        time.sleep(0.05)
-        
         # Paste using system shortcut
-        script = 'tell application "System Events" to keystroke "v" using command down'
-        subprocess.run(['osascript', '-e', script], check=True)
+        press_cmd_v()
         
-        # Wait for paste to complete before restoring clipboard
+        # Wait for paste to complete before restoring clipboard - the target app reads the
+        # pasteboard whenever it handles Cmd-V, and nothing tells us when that happened
         time.sleep(0.2)
         
         # Restore original clipboard content
@@ -492,69 +935,62 @@ def paste_text(text):
         logger.error(f"❌ Paste error: {e}")
         transcript_logger.error(f"PASTE_ERROR: {e}")
 
+def command_worker():
+    """Run start/stop requests from the key handler one at a time, in order"""
+    while True:
+        command = command_queue.get()
+        try:
+            command()
+        except Exception as e:
+            logger.error(f"❌ {command.__name__} error: {e}")
+
 def handler(event):
     """Global key event handler - SINGLE UNIFIED HANDLER"""
-    global trigger_pressed, last_trigger_time, handler_active
-    
-    # Prevent re-entrant handler calls
-    if handler_active:
-        return
-    
-    handler_active = True
+    global trigger_pressed
     
+    # The global monitor delivers events serially on the main run loop - no re-entrancy guard needed
     try:
-        current_time = time.time()
-        if current_time - last_trigger_time < DEBOUNCE_DELAY:
-            return # Debounce
-
-        event_type = event.type()
-        key_code = event.keyCode()
-        flags = event.modifierFlags()
-        
-        # SINGLE TRIGGER KEY LOGIC - NO DUPLICATES
-        is_trigger = is_trigger_key(key_code, flags)
-        if not is_trigger:
+        # SINGLE TRIGGER KEY LOGIC - bail out on any other key before any other work
+        if event.keyCode() != TRIGGER_KEY_CODE:
             return
-            
+        
+        # Press/release edges are tracked by trigger_pressed, so a quick re-press after a
+        # release still registers - no time-based debounce
+        
         # Handle Fn key based on flags (special case)
-        if TRIGGER_KEY == 'fn':
-            fn_currently_pressed = is_fn_pressed(flags)
+        if TRIGGER_IS_FN:
+            fn_currently_pressed = (event.modifierFlags() & FN_KEY_MASK) != 0
             
             if fn_currently_pressed and not trigger_pressed:
                 logger.info("🎤 Recording started...")
-                play_sound("sounds/press.wav")
+                play_sound(PRESS_SOUND)
                 trigger_pressed = True
-                last_trigger_time = current_time
-                threading.Thread(target=start_recording, daemon=True).start()
+                command_queue.put(start_recording)
             elif not fn_currently_pressed and trigger_pressed:
                 logger.info("🛑 Recording stopped...")
-                play_sound("sounds/release.wav")
+                play_sound(RELEASE_SOUND)
                 trigger_pressed = False
-                last_trigger_time = current_time
-                threading.Thread(target=stop_recording, daemon=True).start()
+                command_queue.put(stop_recording)
         
         # Handle all other trigger keys (unified logic)
         else:
+            event_type = event.type()
             # Key down
-            if (event_type == NSKeyDownMask or event_type == NSFlagsChangedMask) and not trigger_pressed:
+            if (event_type == NSKeyDown or event_type == NSFlagsChanged) and not trigger_pressed:
                 logger.info("🎤 Recording started...")
-                play_sound("sounds/press.wav")
+                play_sound(PRESS_SOUND)
                 trigger_pressed = True
-                last_trigger_time = current_time
-                threading.Thread(target=start_recording, daemon=True).start()
+                command_queue.put(start_recording)
             
             # Key up
-            elif (event_type == NSKeyUpMask or event_type == NSFlagsChangedMask) and trigger_pressed:
+            elif (event_type == NSKeyUp or event_type == NSFlagsChanged) and trigger_pressed:
                 logger.info("🛑 Recording stopped...")
-                play_sound("sounds/release.wav")
+                play_sound(RELEASE_SOUND)
                 trigger_pressed = False
-                last_trigger_time = current_time
-                threading.Thread(target=stop_recording, daemon=True).start()
+                command_queue.put(stop_recording)
         
     except Exception as e:
         logger.error(f"❌ Key handler error: {e}")
-    finally:
-        handler_active = False
 
 class AppDelegate(NSObject):
     def applicationDidFinishLaunching_(self, notification):
@@ -567,8 +1003,9 @@ class AppDelegate(NSObject):
             NSEvent.removeMonitor_(global_event_monitor)
             global_event_monitor = None
         
-        # Register SINGLE global event monitor
-        mask = NSKeyDownMask | NSKeyUpMask | NSFlagsChangedMask
+        # Register SINGLE global event monitor - modifier triggers only ever send
+        # flagsChanged, so don't get called back for every keystroke in every app
+        mask = NSFlagsChangedMask if TRIGGER_KEY in MODIFIER_TRIGGER_KEYS else NSKeyDownMask | NSKeyUpMask
         global_event_monitor = NSEvent.addGlobalMonitorForEventsMatchingMask_handler_(mask, handler)
         
         if global_event_monitor:
@@ -578,15 +1015,12 @@ class AppDelegate(NSObject):
 
 def cleanup_application():
     """Robust application cleanup"""
-    global audio, global_event_monitor, ws_app, ws_thread, recording, connecting, connection_active
+    global audio, global_event_monitor, ws_app, ws_thread, state
     
     logger.info("🧹 Cleaning up application resources...")
     
     # Stop all recording/connection activity
-    recording = False
-    connecting = False
-    connection_active = False
-    stop_event.set()
+    state = State.IDLE
     
     # Clean up event monitor
     if global_event_monitor:
@@ -610,8 +1044,12 @@ def cleanup_application():
         except:
             pass
     
+    # Stop the sound fallback worker
+    sound_executor.shutdown(wait=False)
+    
     # Clean up audio
     cleanup_audio()
+    close_microphone()
     if audio:
         try:
             audio.terminate()
@@ -630,10 +1068,19 @@ def main():
     logger.info("🎤 Starting Wispr...")
     logger.info("📋 Make sure to grant Accessibility and Microphone permissions")
     logger.info(f"🎯 Trigger key: {TRIGGER_KEY}")
+    if TRIGGER_KEY_CODE is None:
+        logger.warning(f"⚠️ Unknown trigger key '{TRIGGER_KEY}', options: {', '.join(TRIGGER_KEY_CODES)}")
     
     if not init_audio():
         sys.exit(1)
     
+    init_sounds()
+    
+    init_microphone()
+    
+    # One long-lived worker keeps the Cocoa thread free and serializes start/stop
+    threading.Thread(target=command_worker, daemon=True, name="wispr-commands").start()
+    
     # Register cleanup handler
     atexit.register(cleanup_application)
     
@@ -656,56 +1103,39 @@ def main():
 # Single instance protection
 def ensure_single_instance():
     """Ensure only one instance of Wispr is running"""
+    global pid_lock_fd
     pid_file = Path.home() / "Library" / "Application Support" / "Wispr" / "wispr.pid"
     pid_file.parent.mkdir(parents=True, exist_ok=True)
     
-    # Check if PID file exists
-    if pid_file.exists():
+    # The kernel drops the lock when its holder exits (crash included), so there is
+    # never a stale PID file to second-guess
+    pid_lock_fd = os.open(pid_file, os.O_RDWR | os.O_CREAT, 0o644)
+    if not try_lock_pid_file():
         try:
-            with open(pid_file, 'r') as f:
-                old_pid = int(f.read().strip())
-            
-            # Check if process is still running
-            try:
-                os.kill(old_pid, 0)  # Signal 0 just checks if process exists
-                # Process exists, try to kill it
-                logger.warning(f"⚠️ Found existing Wispr process (PID {old_pid}), terminating it...")
-                os.kill(old_pid, signal.SIGTERM)
-                time.sleep(1)
-                
-                # Check if it's still running
-                try:
-                    os.kill(old_pid, 0)
-                    logger.error(f"❌ Failed to terminate existing process (PID {old_pid})")
-                    sys.exit(1)
-                except ProcessLookupError:
-                    logger.info(f"✅ Successfully terminated existing process")
-                    
-            except ProcessLookupError:
-                # Process doesn't exist, PID file is stale
-                logger.info("🧹 Removing stale PID file")
-                
-        except (ValueError, IOError):
-            logger.warning("⚠️ Invalid PID file, removing")
+            old_pid = int(os.pread(pid_lock_fd, 32, 0).decode().strip())
+            # Process exists, try to kill it
+            logger.warning(f"⚠️ Found existing Wispr process (PID {old_pid}), terminating it...")
+            os.kill(old_pid, signal.SIGTERM)
+        except (ValueError, OSError) as e:
+            # Unreadable PID, or one that's gone or now belongs to someone else - a stale lock
+            logger.warning(f"⚠️ PID file locked by an unknown process ({e}), waiting for it")
+        
+        # Take over as soon as the old instance releases the lock
+        deadline = time.monotonic() + SINGLE_INSTANCE_TIMEOUT
+        while not try_lock_pid_file():
+            if time.monotonic() > deadline:
+                logger.error("❌ Failed to terminate existing process")
+                sys.exit(1)
+            time.sleep(0.05)
+        logger.info("✅ Successfully terminated existing process")
     
     # Write our PID
-    with open(pid_file, 'w') as f:
-        f.write(str(os.getpid()))
-    
-    # Clean up PID file on exit
-    def cleanup_pid_file():
-        try:
-            if pid_file.exists():
-                pid_file.unlink()
-        except:
-            pass
-    
-    atexit.register(cleanup_pid_file)
+    os.ftruncate(pid_lock_fd, 0)
+    os.pwrite(pid_lock_fd, str(os.getpid()).encode(), 0)
     
     # Handle signals for clean shutdown
     def signal_handler(signum, frame):
         logger.info(f"📡 Received signal {signum}, shutting down...")
-        cleanup_pid_file()
         sys.exit(0)
     
     signal.signal(signal.SIGTERM, signal_handler)
@@ -713,5 +1143,13 @@ def ensure_single_instance():
     
     return pid_file
 
+def try_lock_pid_file():
+    """Take the single-instance lock without blocking"""
+    try:
+        fcntl.flock(pid_lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
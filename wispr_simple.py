@@ -9,61 +9,180 @@ import sys
 import time
 import json
 import threading
+import enum
+import operator
+import queue
+import socket
 import subprocess
 import websocket
 import pyaudio
-import wave
+from array import array
+from collections import deque
+from pathlib import Path
+from urllib.parse import urlencode
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
-# macOS imports
-from AppKit import NSApplication, NSApp
-from Foundation import NSObject, NSLog
-from Cocoa import NSEvent, NSKeyDownMask, NSKeyUpMask, NSFlagsChangedMask
-from PyObjCTools import AppHelper
-from AppKit import NSPasteboard, NSStringPboardType
+try:
+    from orjson import loads as json_loads  # C parser, noticeably faster on the partial stream
+except ImportError:
+    json_loads = json.loads
 
 # Load environment
 load_dotenv()
 
+def env_number(name, default, parse=int):
+    """Numeric setting from the environment - a typo warns and keeps the default"""
+    value = os.getenv(name, '').strip()
+    if not value:
+        return default
+    try:
+        return parse(value)
+    except ValueError:
+        print(f"⚠️ {name}={value!r} isn't a number, using {default}")
+        return default
+
 # Config
 API_KEY = os.getenv('ASSEMBLYAI_API_KEY')
 TRIGGER_KEY = os.getenv('WISPR_TRIGGER_KEY', 'fn')
 
+# Trigger key -> macOS virtual key code, resolved once so the key handler only compares ints
+TRIGGER_KEY_CODES = {
+    'fn': 63,  # Detected by flags: 0x800000 = pressed
+    'right_cmd': 54,
+    'right_ctrl': 62,
+    'caps_lock': 57,
+    'backslash': 42,
+}
+TRIGGER_KEY_CODE = TRIGGER_KEY_CODES.get(TRIGGER_KEY)
+TRIGGER_IS_FN = TRIGGER_KEY == 'fn'
+FN_KEY_MASK = 0x800000  # NSFunctionKeyMask
+
 if not API_KEY or API_KEY == 'your_api_key_here':
     print("❌ Please edit .env and add your AssemblyAI API key")
     sys.exit(1)
 
+# macOS imports - loaded after the key check so a misconfigured run exits without the ObjC bridge
+from AppKit import NSApplication, NSApp
+from Foundation import NSObject
+from Cocoa import NSEvent, NSKeyDownMask, NSKeyUpMask, NSFlagsChangedMask, NSKeyDown, NSKeyUp, NSFlagsChanged
+from PyObjCTools import AppHelper
+from AppKit import NSPasteboard, NSStringPboardType, NSSound
+from Quartz import (
+    CGEventCreateKeyboardEvent, CGEventPost, CGEventSetFlags, kCGHIDEventTap, kCGEventFlagMaskCommand,
+    CGEventSourceCreate, kCGEventSourceStateHIDSystemState,
+)
+
 # Audio settings
 SAMPLE_RATE = 16000
 CHANNELS = 1
 FORMAT = pyaudio.paInt16
-FRAMES_PER_BUFFER = 800  # 50ms chunks work fine with v3 API
-from urllib.parse import urlencode
+FRAMES_PER_BUFFER = min(max(160, env_number('WISPR_AUDIO_BUFFER', 800)), SAMPLE_RATE)  # Capture size, 800 = 50ms, at most 1s
+# AssemblyAI rejects messages outside 50-1000ms of audio
+MIN_MESSAGE_MS, MAX_MESSAGE_MS = 50, 1000
+SEND_BATCH_MS = min(max(env_number('WISPR_SEND_BATCH_MS', 100), MIN_MESSAGE_MS), MAX_MESSAGE_MS)  # Audio per WebSocket message
+MIN_MESSAGE_BYTES = SAMPLE_RATE * MIN_MESSAGE_MS // 1000 * 2  # 16-bit mono samples
+
+def ms_to_buffers(ms):
+    """Number of capture buffers covering at least ms milliseconds of audio"""
+    return max(1, -(-ms * SAMPLE_RATE // (1000 * FRAMES_PER_BUFFER)))
+
+def batch_buffers(ms):
+    """Capture buffers per WebSocket message - at least ms of audio, never over MAX_MESSAGE_MS"""
+    buffers = ms_to_buffers(ms)
+    if buffers * FRAMES_PER_BUFFER * 1000 > MAX_MESSAGE_MS * SAMPLE_RATE:
+        buffers -= 1  # Round down instead - one buffer never exceeds it
+    return buffers
+
+SEND_BATCH_BUFFERS = batch_buffers(SEND_BATCH_MS)
+
+# Optional silence gate: buffers quieter than this RMS (int16 scale) aren't uploaded. 0 = off.
+SILENCE_GATE_RMS = env_number('WISPR_SILENCE_GATE', 0)
+SILENCE_GATE_POWER = SILENCE_GATE_RMS ** 2  # Compare mean squares - no sqrt per buffer
+
+# Optional WebRTC VAD for the same gate (0-3, higher = stricter). Empty = off; needs webrtcvad.
+VAD_MODE = os.getenv('WISPR_VAD_MODE', '').strip()
+VAD_FRAME_BYTES = SAMPLE_RATE // 100 * 2  # webrtcvad only takes 10/20/30ms frames
+vad = None
+if VAD_MODE:
+    try:
+        import webrtcvad
+        vad = webrtcvad.Vad(min(max(int(VAD_MODE), 0), 3))
+    except ImportError:
+        print("⚠️ WISPR_VAD_MODE is set but webrtcvad isn't installed, using the RMS gate")
+    except ValueError:
+        print(f"⚠️ WISPR_VAD_MODE must be 0-3, got {VAD_MODE!r} - using the RMS gate")
+GATE_ENABLED = bool(vad or SILENCE_GATE_POWER)
+GATE_PREROLL_BUFFERS = ms_to_buffers(200)     # Sent ahead of speech so word onsets aren't clipped
+GATE_HANGOVER_BUFFERS = ms_to_buffers(500)    # Kept after speech so the server still hears the pause
+GATE_KEEPALIVE_BUFFERS = ms_to_buffers(1000)  # Still send one buffer per second of silence
+
+# Keep the session open between presses; the server closes it after this many idle
+# seconds (AssemblyAI accepts 5-3600). 0 = a new connection for every press.
+SESSION_IDLE_TIMEOUT = env_number('WISPR_SESSION_IDLE_TIMEOUT', 60)
+if SESSION_IDLE_TIMEOUT:
+    SESSION_IDLE_TIMEOUT = min(max(SESSION_IDLE_TIMEOUT, 5), 3600)
 
 CONNECTION_PARAMS = {
     "sample_rate": SAMPLE_RATE,
     "format_turns": True,
 }
+if SESSION_IDLE_TIMEOUT:
+    CONNECTION_PARAMS["inactivity_timeout"] = SESSION_IDLE_TIMEOUT
 API_ENDPOINT = f"wss://streaming.assemblyai.com/v3/ws?{urlencode(CONNECTION_PARAMS)}"
-YOUR_API_KEY = API_KEY
+WS_HEADER = {"Authorization": API_KEY}  # Built once, reused for every connection
+TERMINATE_MESSAGE = b'{"type": "Terminate"}'  # Pre-encoded, sent as a text frame
+FORCE_ENDPOINT_MESSAGE = b'{"type": "ForceEndpoint"}'  # Ends the open turn, keeps the session
+TERMINATION_TIMEOUT = 1.5  # Max wait for the server to flush final turns after Terminate/ForceEndpoint
+WS_SOCKOPT = (
+    # Push each small audio frame out immediately instead of letting Nagle coalesce it
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    # ~1s of audio, so a stalled link can't hide seconds of stale audio in the kernel
+    (socket.SOL_SOCKET, socket.SO_SNDBUF, 32 * 1024),
+)
+# Transcripts are JSON we parse anyway, so skip websocket-client's per-byte UTF-8
+# validation (messages arrive as bytes)
+WS_RUN_OPTIONS = {"skip_utf8_validation": True, "sockopt": WS_SOCKOPT}
+if SESSION_IDLE_TIMEOUT:
+    # Ping the idle session so a dropped link is noticed before the next press, not during it
+    WS_RUN_OPTIONS.update(ping_interval=20, ping_timeout=10)
+
+# Feedback sounds (resolved once, independent of the working directory)
+SOUNDS_DIR = Path(__file__).resolve().parent / "sounds"
+PRESS_SOUND = str(SOUNDS_DIR / "press.wav")
+RELEASE_SOUND = str(SOUNDS_DIR / "release.wav")
+
+class State(enum.Enum):
+    """Recording lifecycle - the command worker and the WebSocket thread both move it"""
+    IDLE = 0
+    CONNECTING = 1  # Mic open, waiting for the WebSocket handshake
+    STREAMING = 2
+    STOPPING = 3  # Waiting for the final turns, then pasting
 
 # Global state
 trigger_pressed = False
-recording = False
-connecting = False  # Track connection state
-connection_active = False  # Track if we have an active connection
+state = State.IDLE
+state_lock = threading.Lock()  # Guards state transitions across the worker and WebSocket threads
 audio = None
 stream = None
 ws_app = None
 ws_thread = None
-stop_event = threading.Event()
+stream_thread = None
+audio_queue = queue.SimpleQueue()  # PCM buffers handed over by the PortAudio callback
+STOP_SENTINEL = None  # Queued after the mic stops to end the streaming thread
+termination_event = threading.Event()  # Set once the server confirms the session ended
+turn_event = threading.Event()  # Set when a final turn arrives
 final_transcript = ""
-last_trigger_time = 0
+last_partial = ""  # Last partial transcript drawn on the terminal
+last_partial_print_time = 0
+PARTIAL_PRINT_INTERVAL = 0.25
 last_stop_time = 0
 recording_start_time = 0  # Track actual recording start
-DEBOUNCE_DELAY = 0.3 # 300ms debounce
 MIN_RECORDING_DURATION = 0.5  # 500ms minimum recording
-CONNECTION_COOLDOWN = 2.0  # 2 seconds between connections (more conservative)
+CONNECTION_COOLDOWN = 2.0  # Between new connections - a press on the warm session skips it
+loaded_sounds = {}  # Preloaded NSSound per sound file
+command_queue = queue.SimpleQueue()  # start_recording/stop_recording for the command worker
+sound_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wispr-sound")  # afplay fallback
 
 def init_audio():
     """Initialize PyAudio"""
@@ -76,8 +195,78 @@ def init_audio():
         print(f"❌ Audio initialization failed: {e}")
         return False
 
+def init_microphone():
+    """Pre-open the input stream - opening the device is the slow part of starting capture"""
+    global stream
+    try:
+        stream = open_input_stream()
+    except Exception as e:
+        print(f"⚠️ Could not pre-open microphone ({e}), will retry on first press")
+
+def open_input_stream():
+    """Open the microphone in callback mode, stopped until a recording starts it"""
+    return audio.open(
+        input=True,
+        frames_per_buffer=FRAMES_PER_BUFFER,
+        channels=CHANNELS,
+        format=FORMAT,
+        rate=SAMPLE_RATE,
+        stream_callback=audio_callback,
+        start=False,
+    )
+
+def open_microphone():
+    """Start capturing on the pre-opened stream"""
+    global stream
+    # Drop any audio left over from a previous session
+    while not audio_queue.empty():
+        audio_queue.get_nowait()
+    
+    if stream is None:
+        stream = open_input_stream()
+    try:
+        stream.start_stream()
+    except Exception as e:
+        # The device may have gone away since the stream was opened - reopen once
+        print(f"⚠️ Could not restart audio stream ({e}), reopening")
+        close_microphone()
+        stream = open_input_stream()
+        stream.start_stream()
+
+def close_microphone():
+    """Release the input stream entirely"""
+    global stream
+    if stream:
+        try:
+            stream.close()
+        except Exception as e:
+            print(f"❌ Audio close error: {e}")
+        finally:
+            stream = None
+
+def init_sounds():
+    """Preload feedback sounds so triggers don't spawn an afplay process each time"""
+    for sound_file in (PRESS_SOUND, RELEASE_SOUND):
+        sound = NSSound.alloc().initWithContentsOfFile_byReference_(sound_file, True)
+        if sound:
+            loaded_sounds[sound_file] = sound
+        else:
+            print(f"⚠️ Could not preload {sound_file}, falling back to afplay")
+
+def audio_callback(in_data, frame_count, time_info, status):
+    """PortAudio callback - hand captured PCM to the streaming thread"""
+    audio_queue.put_nowait(in_data)
+    return (None, pyaudio.paContinue)
+
 def play_sound(sound_file):
     """Play a sound file asynchronously"""
+    sound = loaded_sounds.get(sound_file)
+    if sound:
+        # NSSound plays in-process and returns immediately; stop() rewinds a sound still playing
+        sound.stop()
+        sound.play()
+        return
+    
     def _play():
         try:
             # Use macOS built-in afplay for simple and reliable playback
@@ -85,56 +274,110 @@ def play_sound(sound_file):
         except Exception as e:
             print(f"❌ Sound playback error: {e}")
     
-    # Play sound in background thread to not block main functionality
-    threading.Thread(target=_play, daemon=True).start()
-
-def is_trigger_key(key_code, flags):
-    """Check if this is our trigger key"""
-    if TRIGGER_KEY == 'fn':
-        # Fn key is code=63, detect by flags: 0x800000 = pressed, 0x100 = released
-        return key_code == 63
-    elif TRIGGER_KEY == 'right_cmd':
-        return key_code == 54
-    elif TRIGGER_KEY == 'right_ctrl':
-        return key_code == 62
-    elif TRIGGER_KEY == 'caps_lock':
-        return key_code == 57
-    elif TRIGGER_KEY == 'backslash':
-        return key_code == 42
-    else:
-        return False
+    # Play sound on the reusable worker to not block main functionality
+    sound_executor.submit(_play)
+
+def buffer_power(buf):
+    """Mean square of a native-endian int16 PCM buffer"""
+    samples = array('h', buf)
+    return sum(map(operator.mul, samples, samples)) // len(samples)
 
-def is_fn_pressed(flags):
-    """Check if Fn key is currently pressed based on flags"""
-    return (flags & 0x800000) != 0  # NSFunctionKeyMask
+def buffer_has_speech(buf):
+    """Whether a capture buffer should open the silence gate"""
+    if vad:
+        # Speech in any 10ms slice counts - an onset can land anywhere in the buffer
+        return any(vad.is_speech(buf[i:i + VAD_FRAME_BYTES], SAMPLE_RATE)
+                   for i in range(0, len(buf) - VAD_FRAME_BYTES + 1, VAD_FRAME_BYTES))
+    return buffer_power(buf) >= SILENCE_GATE_POWER
+
+def stream_audio(ws):
+    """Forward captured audio to the session until the sentinel arrives"""
+    # Coalesce several buffers per message to cut per-frame WS/TLS/syscall overhead.
+    # The batch is allocated once and filled in place; the frame is built synchronously
+    # in send(), so the same bytearray is handed over directly and refilled afterwards.
+    batch_bytes = SEND_BATCH_BUFFERS * FRAMES_PER_BUFFER * 2  # 16-bit mono samples
+    batch = bytearray(batch_bytes)
+    filled = 0
+    # Silence gate state - held-back buffers stay in order so audio is never reordered
+    preroll = deque()
+    hangover = 0
+    silent = 0  # Gated buffers so far, paces the keepalive
+    while True:
+        # Blocks until PortAudio delivers a buffer
+        data = audio_queue.get()
+        if data is STOP_SENTINEL:
+            break
+        chunks = (data,)
+        if GATE_ENABLED:
+            if buffer_has_speech(data):
+                hangover = GATE_HANGOVER_BUFFERS
+                if preroll:
+                    # Held-back pre-roll goes out ahead of the onset, oldest first
+                    preroll.append(data)
+                    chunks = tuple(preroll)
+                    preroll.clear()
+            elif hangover:
+                hangover -= 1
+            else:
+                preroll.append(data)
+                silent += 1
+                if silent % GATE_KEEPALIVE_BUFFERS:
+                    if len(preroll) > GATE_PREROLL_BUFFERS:
+                        preroll.popleft()  # Dropped silence
+                    continue
+                chunks = (preroll.popleft(),)  # Keepalive: oldest held buffer, keeps the order
+        try:
+            for chunk in chunks:
+                # Capture buffers are all the same size, so they tile the batch exactly
+                end = filled + len(chunk)
+                batch[filled:end] = chunk
+                if end >= batch_bytes:
+                    ws.send(batch, websocket.ABNF.OPCODE_BINARY)
+                    del batch[batch_bytes:]  # No-op unless an odd-sized buffer grew it
+                    filled = 0
+                else:
+                    filled = end
+        except Exception as e:
+            print(f"❌ Streaming error: {e}")
+            return
+    
+    # Flush the partial batch so the tail isn't dropped
+    if filled:
+        if filled < MIN_MESSAGE_BYTES:
+            # Pad a short tail with silence rather than send an undersized message
+            batch[filled:MIN_MESSAGE_BYTES] = bytes(MIN_MESSAGE_BYTES - filled)
+            filled = MIN_MESSAGE_BYTES
+        try:
+            ws.send(batch[:filled], websocket.ABNF.OPCODE_BINARY)
+        except Exception as e:
+            print(f"❌ Streaming flush error: {e}")
+
+def begin_streaming(ws):
+    """Mark the recording live and start the sender thread - call with state_lock held"""
+    global state, recording_start_time, stream_thread
+    state = State.STREAMING
+    recording_start_time = time.time()  # Set actual recording start time
+    stream_thread = threading.Thread(target=stream_audio, args=(ws,), daemon=True)
+    stream_thread.start()
 
 def on_ws_open(ws):
     """WebSocket opened"""
-    global recording, connecting, recording_start_time, connection_active
+    with state_lock:
+        # A handshake that finishes after its press was discarded must not take over a newer one
+        stale = ws is not ws_app
+        # Released mid-handshake on a warm session - then it just stays open for the next press
+        if not stale and state is State.CONNECTING:
+            begin_streaming(ws)
+    if stale:
+        ws.close()  # Released while connecting - stop_recording already dropped this session
+        return
     print("🔗 Connected to AssemblyAI")
-    connecting = False
-    recording = True
-    connection_active = True
-    recording_start_time = time.time()  # Set actual recording start time
-    
-    def stream_audio():
-        global recording, stream, stop_event
-        while recording and not stop_event.is_set():
-            try:
-                if stream and stream.is_active():
-                    data = stream.read(FRAMES_PER_BUFFER, exception_on_overflow=False)
-                    ws.send(data, websocket.ABNF.OPCODE_BINARY)
-            except Exception as e:
-                print(f"❌ Streaming error: {e}")
-                break
-    
-    threading.Thread(target=stream_audio, daemon=True).start()
 
 def on_ws_message(ws, message):
     """Handle WebSocket message"""
-    global final_transcript
+    global final_transcript, last_partial, last_partial_print_time
     try:
-        data = json.loads(message)
+        data = json_loads(message)
         msg_type = data.get('type')
         
         if msg_type == "Begin":
@@ -145,6 +388,8 @@ def on_ws_message(ws, message):
             formatted = data.get('turn_is_formatted', False)
             if formatted:
                 transcript_text = transcript.strip()
+                if state not in (State.STREAMING, State.STOPPING):
+                    transcript_text = ""  # Arrived after the paste - it belongs to no recording
                 if transcript_text:
                     # Accumulate all transcript segments, don't replace!
                     if final_transcript:
@@ -154,70 +399,104 @@ def on_ws_message(ws, message):
                     print(f"📝 Added segment: \"{transcript_text}\"")
                     print(f"📝 Full transcript so far: \"{final_transcript}\"")
                     # Don't paste yet! Wait for Fn key release
+                turn_event.set()  # Final turn delivered
             else:
-                # Partial transcript, show as it comes
-                print(f"\r{transcript}", end='')
+                # Partial transcript - redraw at most every 250ms, and only when it changed
+                now = time.monotonic()
+                if transcript != last_partial and now - last_partial_print_time > PARTIAL_PRINT_INTERVAL:
+                    last_partial = transcript
+                    last_partial_print_time = now
+                    sys.stdout.write(f"\r{transcript}")
+                    sys.stdout.flush()
         elif msg_type == "Termination":
             print("🔚 Session terminated")
+            termination_event.set()  # All final turns have been delivered
     except Exception as e:
         print(f"❌ Message handling error: {e}")
 
 def on_ws_error(ws, error):
-    """WebSocket error"""
-    global recording, connecting, connection_active
+    """WebSocket error - on_ws_close follows and resets the state"""
     print(f"❌ Connection error: {error}")
-    stop_event.set()
-    recording = False
-    connecting = False
-    connection_active = False
 
 def on_ws_close(ws, close_status_code, close_msg):
     """WebSocket closed"""
-    global recording, connecting, last_stop_time, connection_active
+    global state, last_stop_time, ws_app, ws_thread
     if close_status_code:
         print(f"🔌 Disconnected: {close_status_code}")
         if close_status_code == 1008:
             print("⚠️ Policy violation detected - enforcing longer cooldown")
             last_stop_time = time.time()  # Force cooldown
-    recording = False
-    connecting = False
-    connection_active = False
-    cleanup_audio()
+    with state_lock:
+        if ws is not ws_app:
+            return  # A session stop_recording already dropped - don't touch the current one
+        stopping = state is State.STOPPING
+        if not stopping:
+            state = State.IDLE  # Dropped mid-recording; a stopping session is finished by stop_recording
+            ws_app = ws_thread = None  # Gone - the next press connects afresh
+    termination_event.set()  # Nothing more will arrive - don't keep stop_recording waiting
+    turn_event.set()
+    if not stopping:
+        cleanup_audio()
+
+def session_connected():
+    """Check whether the warm session can take another recording"""
+    sock = getattr(ws_app, 'sock', None)
+    return sock is not None and sock.connected
 
 def start_recording():
     """Start recording"""
-    global recording, connecting, stream, ws_app, ws_thread, stop_event, final_transcript, last_stop_time, connection_active
+    global state, ws_app, ws_thread, final_transcript
     
-    if recording or connecting or connection_active:
-        print("⚠️ Recording already in progress or connection active")
-        return
-    
-    # Enforce connection cooldown (longer after 1008 errors)
-    current_time = time.time()
-    cooldown_needed = CONNECTION_COOLDOWN
-    if current_time - last_stop_time < cooldown_needed:
-        print(f"⏳ Connection cooldown: {cooldown_needed - (current_time - last_stop_time):.1f}s remaining")
-        return
-    
-    connecting = True
-    recording = False
-    final_transcript = ""
-    stop_event.clear()
+    with state_lock:
+        if state is not State.IDLE:
+            print("⚠️ Recording already in progress or connection active")
+            return
+        # A sender stuck in ws.send would swallow the next recording's queue and sentinel
+        if stream_thread and stream_thread.is_alive():
+            print("⚠️ Previous recording still sending")
+            return
+        
+        final_transcript = ""
+        turn_event.clear()
+        
+        # Warm path: the last press's session is still open, skip the handshake and cooldown
+        if session_connected():
+            try:
+                open_microphone()
+                begin_streaming(ws_app)
+                print("🔗 Reusing open AssemblyAI session")
+            except Exception as e:
+                print(f"❌ Recording start error: {e}")
+                state = State.IDLE
+                cleanup_audio()
+            return
+        
+        # A handshake is already under way (released before it finished) - ride along
+        if ws_thread and ws_thread.is_alive():
+            try:
+                open_microphone()
+                state = State.CONNECTING
+            except Exception as e:
+                print(f"❌ Recording start error: {e}")
+            return
+        
+        # Enforce connection cooldown (longer after 1008 errors)
+        current_time = time.time()
+        cooldown_needed = CONNECTION_COOLDOWN
+        if current_time - last_stop_time < cooldown_needed:
+            print(f"⏳ Connection cooldown: {cooldown_needed - (current_time - last_stop_time):.1f}s remaining")
+            return
+        state = State.CONNECTING
+        termination_event.clear()
     
     try:
-        # Open microphone
-        stream = audio.open(
-            input=True,
-            frames_per_buffer=FRAMES_PER_BUFFER,
-            channels=CHANNELS,
-            format=FORMAT,
-            rate=SAMPLE_RATE,
-        )
+        # Start the kept-open stream - audio captured while connecting is queued
+        open_microphone()
         
         # Create WebSocket
         ws_app = websocket.WebSocketApp(
             API_ENDPOINT,
-            header={"Authorization": YOUR_API_KEY},
+            header=WS_HEADER,
             on_open=on_ws_open,
             on_message=on_ws_message,
             on_error=on_ws_error,
@@ -225,83 +504,112 @@ def start_recording():
         )
         
         # Start WebSocket in thread
-        ws_thread = threading.Thread(target=ws_app.run_forever)
+        ws_thread = threading.Thread(target=ws_app.run_forever, kwargs=WS_RUN_OPTIONS)
         ws_thread.daemon = True
         ws_thread.start()
         
     except Exception as e:
         print(f"❌ Recording start error: {e}")
-        connecting = False
-        recording = False
-        connection_active = False
+        with state_lock:
+            state = State.IDLE
+        cleanup_audio()
+        close_session()
+
+def finish_turn():
+    """Force the open turn to end and wait for its final text - False if it never came"""
+    turn_event.clear()
+    ws_app.send(FORCE_ENDPOINT_MESSAGE, websocket.ABNF.OPCODE_TEXT)
+    # Always wait for the reply: the last words may not even have shown up as a partial yet
+    if not turn_event.wait(timeout=TERMINATION_TIMEOUT):
+        print("⚠️ No final turn from server, pasting what we have")
+        return False
+    return True
+
+def end_session():
+    """Terminate the session and wait for the server to flush final turns"""
+    ws_app.send(TERMINATE_MESSAGE, websocket.ABNF.OPCODE_TEXT)
+    # Wait for the final turns instead of guessing with a fixed sleep
+    if not termination_event.wait(timeout=TERMINATION_TIMEOUT):
+        print("⚠️ No Termination from server, pasting what we have")
+
+def close_session():
+    """Close the WebSocket and wait for its thread to exit"""
+    global ws_app, ws_thread
+    if ws_app:
+        thread = ws_thread  # on_ws_close may clear the global while we wait
+        try:
+            ws_app.close()
+            if thread and thread is not threading.current_thread() and thread.is_alive():
+                thread.join(timeout=3.0)
+                if thread.is_alive():
+                    print("⚠️ WebSocket thread did not terminate cleanly")
+        except Exception as e:
+            print(f"❌ WebSocket close error: {e}")
+        finally:
+            # Force cleanup
+            ws_app = None
+            ws_thread = None
 
 def stop_recording():
     """Stop recording"""
-    global recording, connecting, ws_app, final_transcript, recording_start_time, last_stop_time, ws_thread, connection_active
-    
-    if not recording and not connecting and not connection_active:
-        return
+    global state, final_transcript, last_stop_time
     
-    # Check minimum recording duration (only if we actually started recording)
     current_time = time.time()
-    if recording_start_time > 0:
-        recording_duration = current_time - recording_start_time
-        
-        if recording_duration < MIN_RECORDING_DURATION:
-            print(f"⚠️ Recording too short ({recording_duration:.1f}s < {MIN_RECORDING_DURATION}s), ignoring")
-            recording = False
-            connecting = False
-            connection_active = False
-            recording_start_time = 0
-            cleanup_audio()
+    with state_lock:
+        if state is State.CONNECTING:
+            # Released before the handshake finished - nothing was streamed. A warm session
+            # can still come up for the next press; otherwise drop the attempt.
+            state = State.IDLE
+            print("⚠️ Released while connecting, discarding")
+            discard = True
+            drop_session = not SESSION_IDLE_TIMEOUT
+            if drop_session:
+                last_stop_time = current_time  # A connection was still opened - keep the cooldown
+        elif state is State.STREAMING:
+            # Check minimum recording duration
+            recording_duration = current_time - recording_start_time
+            discard = recording_duration < MIN_RECORDING_DURATION
+            if discard:
+                state = State.IDLE
+                print(f"⚠️ Recording too short ({recording_duration:.1f}s < {MIN_RECORDING_DURATION}s), ignoring")
+                # Drop the session too, so the discarded audio can't leak into the next turn
+                drop_session = True
+            else:
+                state = State.STOPPING
+                if not SESSION_IDLE_TIMEOUT:
+                    last_stop_time = current_time
+        else:
             return
-    elif connecting:
-        # If we're still connecting, don't allow immediate stop
-        print(f"⚠️ Still connecting, ignoring rapid stop")
+    
+    if discard:
+        cleanup_audio()
+        if drop_session:
+            close_session()
         return
     
-    recording = False
-    connecting = False
-    connection_active = False
-    recording_start_time = 0  # Reset recording start time
-    last_stop_time = current_time
+    # Stop the mic, then let the streaming thread send what was captured before ending the turn
+    cleanup_audio()
+    if stream_thread and stream_thread.is_alive():
+        stream_thread.join(timeout=0.5)
+    if stream_thread and stream_thread.is_alive():
+        # Stuck in ws.send - closing the socket makes the send fail so the sender exits
+        print("⚠️ Audio sender is stalled, dropping the session")
+        close_session()
     
-    # Send termination with better error handling
-    if ws_app and hasattr(ws_app, 'sock') and ws_app.sock:
+    keep_session = bool(SESSION_IDLE_TIMEOUT)
+    if session_connected():
         try:
-            if ws_app.sock.connected:
-                terminate_message = {"type": "Terminate"}
-                ws_app.send(json.dumps(terminate_message))
-                time.sleep(0.1)
+            if SESSION_IDLE_TIMEOUT:
+                # A reply still in flight would land in the next recording - start fresh instead
+                keep_session = finish_turn()
+            else:
+                end_session()
         except Exception as e:
             print(f"❌ Termination error: {e}")
     
-    # Close WebSocket with proper cleanup sequence
-    if ws_app:
-        try:
-            # Signal stop first
-            stop_event.set()
-            time.sleep(0.1)  # Brief pause
-            
-            # Close WebSocket
-            ws_app.close()
-            
-            # Wait for WebSocket thread to finish with robust checking
-            thread_to_join = ws_thread  # Capture reference
-            if thread_to_join and hasattr(thread_to_join, 'is_alive'):
-                try:
-                    if thread_to_join.is_alive():
-                        thread_to_join.join(timeout=3.0)
-                        if thread_to_join.is_alive():
-                            print("⚠️ WebSocket thread did not terminate cleanly")
-                except Exception as e:
-                    print(f"❌ Thread join error: {e}")
-        except Exception as e:
-            print(f"❌ WebSocket close error: {e}")
-        finally:
-            # Force cleanup
-            ws_app = None
-            ws_thread = None
+    # on_ws_close leaves a STOPPING session to us, so ws_thread can't change under us
+    if not keep_session:
+        close_session()
     
     # NOW paste the final transcript when Fn key is released
     if final_transcript:
@@ -309,115 +617,102 @@ def stop_recording():
         paste_text(final_transcript)
         final_transcript = ""  # Clear it
     
-    cleanup_audio()
+    with state_lock:
+        state = State.IDLE
 
 def cleanup_audio():
-    """Clean up audio with better error handling"""
-    global stream, ws_app, ws_thread, stop_event
-    
-    # Signal all threads to stop
-    stop_event.set()
-    
-    # Clean up audio stream with retries
+    """Stop capturing - the stream stays open for the next press"""
     if stream:
         try:
-            # Wait a moment for any ongoing reads to complete
-            time.sleep(0.1)
-            
-            if hasattr(stream, 'is_active') and stream.is_active():
+            # stop_stream() returns once PortAudio has delivered its last callback - no settle sleeps
+            if stream.is_active():
                 stream.stop_stream()
-                time.sleep(0.05)  # Brief pause after stopping
-            
-            if hasattr(stream, 'close'):
-                stream.close()
-                
         except Exception as e:
             print(f"❌ Audio cleanup error: {e}")
-        finally:
-            stream = None
+            close_microphone()  # Start from a fresh stream next time
     
-    # Ensure WebSocket cleanup
-    if ws_app:
-        try:
-            ws_app.close()
-        except:
-            pass
-        finally:
-            ws_app = None
-    
-    # Clean up thread reference
-    ws_thread = None
+    # No more callbacks can fire, so this lands behind the last captured buffer
+    audio_queue.put(STOP_SENTINEL)
+
+V_KEY_CODE = 9  # kVK_ANSI_V
+# One event source for every synthesized keystroke instead of a default one per event
+KEY_EVENT_SOURCE = CGEventSourceCreate(kCGEventSourceStateHIDSystemState)
+
+def press_cmd_v():
+    """Synthesize Cmd-V in-process instead of forking osascript"""
+    for key_down in (True, False):
+        event = CGEventCreateKeyboardEvent(KEY_EVENT_SOURCE, V_KEY_CODE, key_down)
+        CGEventSetFlags(event, kCGEventFlagMaskCommand)
+        CGEventPost(kCGHIDEventTap, event)
 
 def paste_text(text):
     """Paste text at cursor"""
     try:
-        # Copy to clipboard
+        # Copy to clipboard - the write is visible to other apps once setString_ returns
         pasteboard = NSPasteboard.generalPasteboard()
         pasteboard.clearContents()
         pasteboard.setString_forType_(text, NSStringPboardType)
         
         # Paste
-        time.sleep(0.1)
-        script = 'tell application "System Events" to keystroke "v" using command down'
-        subprocess.run(['osascript', '-e', script], check=True)
+        press_cmd_v()
         
         print(f"📋 Pasted: \"{text}\"")
         
     except Exception as e:
         print(f"❌ Paste error: {e}")
 
+def command_worker():
+    """Run start/stop requests from the key handler one at a time, in order"""
+    while True:
+        command = command_queue.get()
+        try:
+            command()
+        except Exception as e:
+            print(f"❌ {command.__name__} error: {e}")
+
 def handler(event):
     """Global key event handler"""
-    global trigger_pressed, last_trigger_time
+    global trigger_pressed
     
-    current_time = time.time()
-    if current_time - last_trigger_time < DEBOUNCE_DELAY:
-        return # Debounce
-
     try:
-        event_type = event.type()
-        key_code = event.keyCode()
-        flags = event.modifierFlags()
-        
-        # Debug output - remove this line to reduce noise
-        # print(f"🔘 Key: type={event_type}, code={key_code}, flags={flags}")
+        # Bail out on any other key before any other work
+        if event.keyCode() != TRIGGER_KEY_CODE:
+            return
         
-        is_trigger = is_trigger_key(key_code, flags)
+        # Press/release edges are tracked by trigger_pressed, so a quick re-press after a
+        # release still registers - no time-based debounce
         
         # Special handling for Fn key based on flags
-        if TRIGGER_KEY == 'fn' and is_trigger:
-            fn_currently_pressed = is_fn_pressed(flags)
+        if TRIGGER_IS_FN:
+            fn_currently_pressed = (event.modifierFlags() & FN_KEY_MASK) != 0
             
             if fn_currently_pressed and not trigger_pressed:
                 print("🎤 Recording started...")
-                play_sound("sounds/press.wav")  # Play press sound
+                play_sound(PRESS_SOUND)  # Play press sound
                 trigger_pressed = True
-                last_trigger_time = current_time
-                threading.Thread(target=start_recording, daemon=True).start()
+                command_queue.put(start_recording)
             elif not fn_currently_pressed and trigger_pressed:
                 print("🛑 Recording stopped...")
-                play_sound("sounds/release.wav")  # Play release sound
+                play_sound(RELEASE_SOUND)  # Play release sound
                 trigger_pressed = False
-                last_trigger_time = current_time
-                threading.Thread(target=stop_recording, daemon=True).start()
+                command_queue.put(stop_recording)
         
         # Regular key handling for other trigger keys
-        elif TRIGGER_KEY != 'fn' and is_trigger:
+        else:
+            event_type = event.type()
             # Key down or flags changed (for modifier keys)
-            if (event_type == NSKeyDownMask or event_type == NSFlagsChangedMask) and not trigger_pressed:
+            if (event_type == NSKeyDown or event_type == NSFlagsChanged) and not trigger_pressed:
                 print("🎤 Recording started...")
-                play_sound("sounds/press.wav")  # Play press sound
+                play_sound(PRESS_SOUND)  # Play press sound
                 trigger_pressed = True
-                last_trigger_time = current_time
-                threading.Thread(target=start_recording, daemon=True).start()
+                command_queue.put(start_recording)
             
             # Key up or flags changed (for modifier keys)
-            elif (event_type == NSKeyUpMask or event_type == NSFlagsChangedMask) and trigger_pressed:
+            elif (event_type == NSKeyUp or event_type == NSFlagsChanged) and trigger_pressed:
                 print("🛑 Recording stopped...")
-                play_sound("sounds/release.wav")  # Play release sound
+                play_sound(RELEASE_SOUND)  # Play release sound
                 trigger_pressed = False
-                last_trigger_time = current_time
-                threading.Thread(target=stop_recording, daemon=True).start()
+                command_queue.put(stop_recording)
         
     except Exception as e:
         print(f"❌ Key handler error: {e}")
@@ -434,10 +729,18 @@ def main():
     print("🎤 Starting Wispr Flow (Simple)...")
     print("📋 Make sure to grant Accessibility and Microphone permissions")
     print(f"🎯 Trigger key: {TRIGGER_KEY}")
+    if TRIGGER_KEY_CODE is None:
+        print(f"⚠️ Unknown trigger key '{TRIGGER_KEY}', options: {', '.join(TRIGGER_KEY_CODES)}")
     
     if not init_audio():
         sys.exit(1)
     
+    init_sounds()
+    init_microphone()
+    
+    # One long-lived worker instead of a thread per key event
+    threading.Thread(target=command_worker, daemon=True).start()
+    
     # Create NSApplication
     app = NSApplication.sharedApplication()
     delegate = AppDelegate.alloc().init()
@@ -450,6 +753,7 @@ def main():
     except Exception as e:
         print(f"❌ Error: {e}")
     finally:
+        close_microphone()
         if audio:
             audio.terminate()
 